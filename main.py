@@ -6,18 +6,24 @@ Shows all artists; adds fuzzy match details only for non-exact matches
 import spotipy
 import os
 from spotipy.oauth2 import SpotifyOAuth
-import json
+import orjson
+import csv
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+import numpy as np
 import time
+import threading
 import re
 import math
 import pytz
 import base64
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from lxml import html
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from urllib.parse import parse_qs, urlparse
-from difflib import SequenceMatcher
+from rapidfuzz import fuzz, process
 
 class Config:
     CLIENT_ID = os.getenv("SPOTIPY_CLIENT_ID")
@@ -26,6 +32,8 @@ class Config:
     SCOPE = """user-read-private user-read-email playlist-read-private 
                playlist-read-collaborative playlist-modify-public playlist-modify-private"""
     CACHE_PATH = ".spotify_cache"
+    ARTIST_CACHE_PATH = ".spotify_artist_cache"
+    ARTIST_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
     
     LAT = 42.004414
     LON = -87.671304
@@ -37,37 +45,98 @@ class Config:
     
     FESTIVAL_PERFORMER_LIMIT = 6
 
+    SEARCH_CONCURRENCY = 10
+    MIN_REQUEST_INTERVAL = 0.1  # seconds between Spotify request starts, across all workers
+    MAX_RETRIES = 3
+    MAX_RETRY_AFTER = 60  # seconds; longer Retry-After waits fail the request instead
+
+_REGION_RE = re.compile(r'\s*\([A-Z]{2,3}\)\s*$')
+
+@lru_cache(maxsize=1024)
+def _parse_event_dt(date_str, time_str, tz_name):
+    """Event start as an aware datetime in tz_name, or None if unparseable"""
+    tz = pytz.timezone(tz_name)
+    try:
+        if 'T' in date_str:
+            try:
+                dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+                return tz.localize(dt) if dt.tzinfo is None else dt.astimezone(tz)
+            except Exception:
+                pass
+        event_date = datetime.strptime(date_str.split('T')[0], '%Y-%m-%d')
+        event_time = datetime.strptime(time_str, '%H:%M').time()
+        return tz.localize(datetime.combine(event_date.date(), event_time))
+    except Exception:
+        return None
+
 class Utils:
     @staticmethod
-    def calculate_distance(lat1, lon1, lat2, lon2):
-        if not all([lat1, lon1, lat2, lon2]):
-            return float('inf')
+    def to_float(value):
         try:
-            lat1, lon1, lat2, lon2 = float(lat1), float(lon1), float(lat2), float(lon2)
-            coords = [math.radians(x) for x in [lat1, lon1, lat2, lon2]]
-            lat1, lon1, lat2, lon2 = coords
-            dlat, dlon = lat2 - lat1, lon2 - lon1
-            a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-            return round(2 * 3956 * math.asin(math.sqrt(a)), 2)
-        except Exception:
-            return float('inf')
+            return float(value)
+        except (TypeError, ValueError):
+            return float('nan')
     
     @staticmethod
-    def clean_artist_name(name):
-        return re.sub(r'\s*\([A-Z]{2,3}\)\s*$', '', name.strip())
+    def calculate_distance_from_origin(lat1_rad, lon1_rad, cos_lat1, lats, lons):
+        """Miles from a fixed origin (radians, precomputed cosine) to each of lats/lons; NaN coords give inf"""
+        lats, lons = np.radians(lats), np.radians(lons)
+        dlat, dlon = lats - lat1_rad, lons - lon1_rad
+        a = np.sin(dlat/2)**2 + cos_lat1 * np.cos(lats) * np.sin(dlon/2)**2
+        d = 2 * 3956 * np.arcsin(np.sqrt(a))
+        return np.where(np.isnan(d), np.inf, np.round(d, 2))
     
     @staticmethod
-    def similarity_score(a, b):
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    def clean_artist_name(name):
+        return _REGION_RE.sub('', name.strip())
     
     @staticmethod
     def has_region_identifier(name):
-        return bool(re.search(r'\s*\([A-Z]{2,3}\)\s*$', name))
+        return bool(_REGION_RE.search(name))
 
 class SpotifyClient:
     def __init__(self):
         self.sp = None
         self.access_token = None
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20))
+        # Shared across search workers: request starts are paced, and a 429's Retry-After
+        # deadline holds back every thread, including ones already waiting for a slot
+        self._retry_lock = threading.Lock()
+        self._retry_until = 0.0
+        self._next_request_at = 0.0
+        self.artist_cache = self._load_artist_cache()
+    
+    def _load_artist_cache(self):
+        try:
+            with open(Config.ARTIST_CACHE_PATH, 'rb') as f:
+                cache = orjson.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading artist cache: {e}")
+            return {}
+        
+        # Ignore a cache file that isn't {key: {'cached_at': ..., 'result': {...}}}
+        valid = (isinstance(cache, dict) and all(
+            isinstance(entry, dict)
+            and isinstance(entry.get('cached_at'), (int, float))
+            and isinstance(entry.get('result'), dict)
+            for entry in cache.values()
+        ))
+        if not valid:
+            print("Ignoring malformed artist cache")
+            return {}
+        return cache
+    
+    def save_artist_cache(self):
+        cutoff = time.time() - Config.ARTIST_CACHE_TTL
+        fresh = {k: v for k, v in self.artist_cache.items() if v['cached_at'] >= cutoff}
+        try:
+            with open(Config.ARTIST_CACHE_PATH, 'wb') as f:
+                f.write(orjson.dumps(fresh))
+        except Exception as e:
+            print(f"Error saving artist cache: {e}")
     
     def authenticate(self):
         print("Authenticating with Spotify...")
@@ -106,7 +175,7 @@ class SpotifyClient:
         b64_auth = base64.b64encode(auth_string.encode()).decode()
         
         try:
-            response = requests.post(
+            response = self.http.post(
                 'https://accounts.spotify.com/api/token',
                 headers={
                     'Authorization': f'Basic {b64_auth}',
@@ -121,6 +190,52 @@ class SpotifyClient:
             print(f"Error getting search token: {e}")
             return False
     
+    def _wait_for_request_slot(self):
+        """Block until this thread may start a request: paced, and past any 429 deadline"""
+        with self._retry_lock:
+            start = max(time.monotonic(), self._next_request_at, self._retry_until)
+            self._next_request_at = start + Config.MIN_REQUEST_INTERVAL
+        while True:
+            time.sleep(max(0.0, start - time.monotonic()))
+            with self._retry_lock:
+                if self._retry_until <= time.monotonic():
+                    return
+                # A 429 arrived while we waited; queue behind its deadline
+                start = max(self._next_request_at, self._retry_until)
+                self._next_request_at = start + Config.MIN_REQUEST_INTERVAL
+    
+    @staticmethod
+    def _retry_after_seconds(response):
+        """Retry-After as seconds; accepts delta-seconds or an HTTP date, defaults to 1"""
+        value = response.headers.get('Retry-After', '1').strip()
+        try:
+            return max(0, int(value))
+        except ValueError:
+            pass
+        try:
+            retry_date = parsedate_to_datetime(value)
+            if retry_date.tzinfo is None:
+                retry_date = retry_date.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return 1
+    
+    def _get(self, url, headers, params=None):
+        """Rate-limited GET with backoff on 429, honoring Spotify's Retry-After header"""
+        for _ in range(Config.MAX_RETRIES):
+            self._wait_for_request_slot()
+            response = self.http.get(url, headers=headers, params=params)
+            if response.status_code != 429:
+                break
+            retry_after = self._retry_after_seconds(response)
+            if retry_after > Config.MAX_RETRY_AFTER:
+                break  # e.g. quota exhausted for hours: fail this search rather than stall every worker
+            retry_at = time.monotonic() + retry_after
+            with self._retry_lock:
+                self._retry_until = max(self._retry_until, retry_at)
+        response.raise_for_status()
+        return response
+    
     def search_artist(self, artist_name):
         if not self.access_token:
             return {'searched_artist': artist_name, 'error': 'No access token'}
@@ -129,13 +244,18 @@ class SpotifyClient:
         search_name = Utils.clean_artist_name(artist_name)
         has_region = Utils.has_region_identifier(artist_name)
         
+        # Region-tagged names are matched differently, so they get their own entries
+        cache_key = f"{search_name.lower()}|{int(has_region)}"
+        cached = self.artist_cache.get(cache_key)
+        if cached and time.time() - cached['cached_at'] < Config.ARTIST_CACHE_TTL:
+            return {**cached['result'], 'searched_artist': artist_name}
+        
         try:
-            response = requests.get(
+            response = self._get(
                 "https://api.spotify.com/v1/search",
                 headers=headers,
                 params={'q': search_name, 'type': 'artist', 'limit': 50}
             )
-            response.raise_for_status()
             response_data = response.json()
             
             if 'artists' not in response_data:
@@ -160,7 +280,7 @@ class SpotifyClient:
                     'error': 'No tracks found'
                 }
             
-            return {
+            result = {
                 'searched_artist': artist_name,
                 'found_artist': chosen_artist['name'],
                 'uri': track['uri'],
@@ -168,47 +288,39 @@ class SpotifyClient:
                 'similarity_score': similarity,
                 'had_region_identifier': has_region
             }
+            self.artist_cache[cache_key] = {'cached_at': time.time(), 'result': dict(result)}
+            return result
         except Exception as e:
             return {'searched_artist': artist_name, 'error': f'Search error: {str(e)}'}
     
     def _find_best_match(self, artists, original_name, search_name, has_region):
-        exact_matches = []
-        approximate_matches = []
-        
-        for artist in artists:
-            spotify_name = artist['name']
-            
-            if has_region:
-                if Utils.clean_artist_name(spotify_name).lower() == search_name.lower():
-                    exact_matches.append(artist)
-                else:
-                    sim = Utils.similarity_score(search_name, Utils.clean_artist_name(spotify_name))
-                    if sim > 0.8:
-                        approximate_matches.append((artist, sim))
-            else:
-                if spotify_name.lower() == original_name.lower():
-                    exact_matches.append(artist)
-                else:
-                    sim = Utils.similarity_score(original_name, spotify_name)
-                    if sim > 0.6:
-                        approximate_matches.append((artist, sim))
+        if has_region:
+            query, cutoff = search_name, 80
+            choices = {i: Utils.clean_artist_name(a['name']) for i, a in enumerate(artists)}
+        else:
+            query, cutoff = original_name, 60
+            choices = {i: a['name'] for i, a in enumerate(artists)}
         
+        exact_matches = process.extract(
+            query, choices, scorer=fuzz.ratio, processor=str.lower, score_cutoff=100, limit=None
+        )
         if exact_matches:
-            best = max(exact_matches, key=lambda x: x['followers']['total'])
+            best = max((artists[i] for _, _, i in exact_matches), key=lambda x: x['followers']['total'])
             return best, True, 1.0
-        elif approximate_matches:
-            best_match = max(approximate_matches, key=lambda x: x[1])
-            return best_match[0], False, best_match[1]
-        else:
-            return None, False, 0.0
+        
+        best_match = process.extractOne(
+            query, choices, scorer=fuzz.ratio, processor=str.lower, score_cutoff=cutoff
+        )
+        if best_match and best_match[1] > cutoff:
+            return artists[best_match[2]], False, best_match[1] / 100.0
+        return None, False, 0.0
     
     def _get_artist_track(self, artist_id, headers):
         try:
-            response = requests.get(
+            response = self._get(
                 f"https://api.spotify.com/v1/artists/{artist_id}/top-tracks",
                 headers=headers, params={'market': 'US'}
             )
-            response.raise_for_status()
             response_data = response.json()
             if response_data.get('tracks'):
                 return response_data['tracks'][0], False
@@ -216,28 +328,21 @@ class SpotifyClient:
             pass
         
         try:
-            albums_response = requests.get(
+            albums_response = self._get(
                 f"https://api.spotify.com/v1/artists/{artist_id}/albums",
                 headers=headers, params={'limit': 1}
             )
-            albums_response.raise_for_status()
             albums_data = albums_response.json()
             if albums_data.get('items'):
                 album_id = albums_data['items'][0]['id']
-                tracks_response = requests.get(
+                tracks_response = self._get(
                     f"https://api.spotify.com/v1/albums/{album_id}/tracks",
                     headers=headers, params={'limit': 1}
                 )
-                tracks_response.raise_for_status()
                 tracks_data = tracks_response.json()
+                # Simplified album tracks already carry the uri we need
                 if tracks_data.get('items'):
-                    track_id = tracks_data['items'][0]['id']
-                    track_response = requests.get(
-                        f"https://api.spotify.com/v1/tracks/{track_id}",
-                        headers=headers
-                    )
-                    track_response.raise_for_status()
-                    return track_response.json(), True
+                    return tracks_data['items'][0], True
         except Exception:
             pass
         
@@ -260,62 +365,51 @@ class SpotifyClient:
             stats = {'exact': 0, 'fuzzy': 0, 'skipped': 0}
             
             def get_distance(r):
-                dist = r.get('distance_miles', float('inf'))
                 try:
-                    return float(dist) if pd.notna(dist) else float('inf')
+                    dist = float(r.get('distance_miles', float('inf')))
                 except (TypeError, ValueError):
                     return float('inf')
+                return dist if dist == dist else float('inf')  # NaN != NaN
             
             results_sorted = sorted(results, key=get_distance)
             
-            # First: print all artists in order
-            print("\n--- UPCOMING SHOWS (BY PROXIMITY) ---")
-            display_num = 1
+            # Single pass: collect display lines, fuzzy details and playlist tracks
+            display_lines = []
+            fuzzy_lines = []
             for result in results_sorted:
                 if 'error' in result:
                     continue
                 
                 similarity = result['similarity_score']
                 if similarity < Config.SKIP_THRESHOLD:
+                    stats['skipped'] += 1
                     continue
                 
                 dist = result.get('distance_miles', 'Unknown')
                 venue = result.get('venue', 'Unknown Venue')
-                artist = result['found_artist']  # Use the one we found on Spotify
-                print(f"{display_num:2}. {artist} @ {venue} ({dist} mi)")
-                display_num += 1
-            
-            # Then: show details only for fuzzy matches
-            print("\n--- FUZZY MATCH DETAILS ---")
-            has_fuzzy = False
-            for result in results_sorted:
-                if 'error' in result:
-                    continue
+                found = result['found_artist']  # Use the one we found on Spotify
+                display_lines.append(f"{len(display_lines) + 1:2}. {found} @ {venue} ({dist} mi)")
                 
-                similarity = result['similarity_score']
-                if similarity < Config.SKIP_THRESHOLD or result['exact_match']:
-                    continue
+                if result['exact_match']:
+                    stats['exact'] += 1
+                else:
+                    stats['fuzzy'] += 1
+                    orig = result['searched_artist']
+                    fuzzy_lines.append(f"  → '{orig}' → '{found}' @ {venue} ({dist} mi) [{similarity:.0%}]")
                 
-                has_fuzzy = True
-                orig = result['searched_artist']
-                found = result['found_artist']
-                dist = result.get('distance_miles', 'Unknown')
-                venue = result.get('venue', 'Unknown Venue')
-                print(f"  → '{orig}' → '{found}' @ {venue} ({dist} mi) [{similarity:.0%}]")
+                # Build playlist with all valid tracks (in distance order)
+                approved_uris.append(result['uri'])
             
-            if not has_fuzzy:
-                print("  (All matches were exact)")
+            print("\n--- UPCOMING SHOWS (BY PROXIMITY) ---")
+            for line in display_lines:
+                print(line)
             
-            # Now build playlist with all valid tracks (in distance order)
-            for result in results_sorted:
-                if 'error' in result:
-                    continue
-                similarity = result['similarity_score']
-                if similarity >= Config.SKIP_THRESHOLD:
-                    approved_uris.append(result['uri'])
-                    stats['exact' if result['exact_match'] else 'fuzzy'] += 1
-                else:
-                    stats['skipped'] += 1
+            # Then: show details only for fuzzy matches
+            print("\n--- FUZZY MATCH DETAILS ---")
+            for line in fuzzy_lines:
+                print(line)
+            if not fuzzy_lines:
+                print("  (All matches were exact)")
             
             if approved_uris:
                 self._add_tracks_to_playlist(playlist_id, approved_uris)
@@ -363,7 +457,13 @@ class ConcertScraper:
     def __init__(self, lat, lon):
         self.lat = lat
         self.lon = lon
+        self._lat_rad = math.radians(lat)
+        self._lon_rad = math.radians(lon)
+        self._cos_lat = math.cos(self._lat_rad)
         self.chicago_tz = pytz.timezone('America/Chicago')
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0'
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
     
     def get_target_date(self, days_ahead=0):
         """Get the target date in Chicago timezone"""
@@ -386,13 +486,17 @@ class ConcertScraper:
             event_count = 0
             festival_count = 0
             
-            while url:
-                performers_batch, events, festivals, soup = self._scrape_page(url)
-                performers.extend(performers_batch)
-                event_count += events
-                festival_count += festivals
-                url = self._get_next_page_url(soup)
-                time.sleep(1)
+            # Fetch the next page in the background while parsing the current one
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = executor.submit(self._fetch_page, url)
+                while pending:
+                    tree = pending.result()
+                    url = self._get_next_page_url(tree)
+                    pending = executor.submit(self._fetch_page, url) if url else None
+                    performers_batch, events, festivals = self._scrape_page(tree)
+                    performers.extend(performers_batch)
+                    event_count += events
+                    festival_count += festivals
             
             print(f"Found {event_count} events, filtered out {festival_count} festivals")
             print(f"Processing {len(performers)} performers")
@@ -410,19 +514,26 @@ class ConcertScraper:
         params = f"filters%5BmaxDate%5D={month}%2F{day}%2F{year}&filters%5BminDate%5D={month}%2F{day}%2F{year}"
         return f"{base_url}?{params}#metro-area-calendar"
     
-    def _scrape_page(self, url):
+    def _fetch_page(self, url):
         try:
-            page = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+            page = self.session.get(url)
             page.raise_for_status()
-            soup = BeautifulSoup(page.content, "html.parser")
-            
+            return html.fromstring(page.content)
+        except Exception as e:
+            print(f"Error scraping page: {e}")
+            return None
+    
+    def _scrape_page(self, tree):
+        if tree is None:
+            return [], 0, 0
+        try:
             performers = []
             event_count = 0
             festival_count = 0
             
-            for script in soup.find_all("script", type="application/ld+json"):
+            for script in tree.xpath('//script[@type="application/ld+json"]/text()', smart_strings=False):
                 try:
-                    data = json.loads(script.string)
+                    data = orjson.loads(script)
                     events = data if isinstance(data, list) else [data]
                     
                     for event in events:
@@ -442,10 +553,10 @@ class ConcertScraper:
                 except Exception:
                     continue
             
-            return performers, event_count, festival_count, soup
+            return performers, event_count, festival_count
         except Exception as e:
             print(f"Error scraping page: {e}")
-            return [], 0, 0, None
+            return [], 0, 0
     
     def _extract_event_data(self, event):
         start_date = event.get('startDate', '')
@@ -466,24 +577,21 @@ class ConcertScraper:
             lat = geo.get('latitude', '')
             lon = geo.get('longitude', '')
         
-        distance = Utils.calculate_distance(self.lat, self.lon, lat, lon)
-        
         return {
             'venue': venue_name,
             'event_name': event.get('name', ''),
             'event_date': start_date,
             'event_start_time': start_time,
             'latitude': lat,
-            'longitude': lon,
-            'distance_miles': distance
+            'longitude': lon
         }
     
-    def _get_next_page_url(self, soup):
-        if not soup:
+    def _get_next_page_url(self, tree):
+        if tree is None:
             return None
         try:
-            next_link = soup.find("a", class_="next_page")
-            return "https://www.songkick.com" + next_link["href"] if next_link else None
+            next_href = tree.xpath('//a[contains(concat(" ", normalize-space(@class), " "), " next_page ")]/@href')
+            return "https://www.songkick.com" + next_href[0] if next_href else None
         except Exception:
             return None
     
@@ -492,60 +600,55 @@ class ConcertScraper:
             return []
         
         try:
-            df = pd.DataFrame(performers)
-            df = df[df['venue'] != '']
+            performers = [p for p in performers if p['venue'] != '']
+            distances = Utils.calculate_distance_from_origin(
+                self._lat_rad, self._lon_rad, self._cos_lat,
+                np.array([Utils.to_float(p['latitude']) for p in performers]),
+                np.array([Utils.to_float(p['longitude']) for p in performers])
+            )
+            performers = [{**p, 'distance_miles': d} for p, d in zip(performers, distances.tolist())]
     
             current_time = datetime.now(self.chicago_tz)
-            before_filter_count = len(df)
-            df = df[~df.apply(lambda row: self._has_show_started(row, current_time), axis=1)]
-            after_filter_count = len(df)
+            before_filter_count = len(performers)
+            performers = [p for p in performers if not self._has_show_started(p, current_time)]
+            after_filter_count = len(performers)
             filtered_out = before_filter_count - after_filter_count
             if filtered_out > 0:
                 print(f"Filtered out {filtered_out} performers due to shows already started")
 
-            df['distance_sort'] = pd.to_numeric(df['distance_miles'], errors='coerce')
-            df = df.sort_values('distance_sort', na_position='last')
+            performers.sort(key=lambda p: p['distance_miles'])
             
-            try:
-                unique_performers = (df.groupby('performer_name')
-                                   .agg({'venue': 'first', 'distance_miles': 'first'})
-                                   .reset_index())
-            except Exception:
-                unique_performers = df.groupby('performer_name').agg({'venue': 'first', 'distance_miles': 'first'}).reset_index()
+            # Closest show wins for artists with several listed events
+            unique_performers = {}
+            for p in performers:
+                unique_performers.setdefault(p['performer_name'], {
+                    'performer_name': p['performer_name'],
+                    'venue': p['venue'],
+                    'distance_miles': p['distance_miles']
+                })
             
             # Use the target date instead of current time for filename
             target_date = self.get_target_date(days_ahead)
             filename = f'performers_Chicago_{target_date.strftime("%Y-%m-%d_%H-%M")}.csv'
-            df.to_csv(filename, index=False)
+            with open(filename, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=[
+                    'venue', 'event_name', 'event_date', 'event_start_time',
+                    'latitude', 'longitude', 'distance_miles', 'performer_name'
+                ])
+                writer.writeheader()
+                writer.writerows(performers)
             print(f"Saved data to: {filename}")
             
-            return unique_performers.to_dict('records')
+            return list(unique_performers.values())
         except Exception as e:
             print(f"Error processing performers: {e}")
             return []
 
-    def _has_show_started(self, row, current_time):
-        if not row['event_start_time']:
-            return False
-        try:
-            event_date_str = row['event_date']
-            event_time_str = row['event_start_time']
-            if 'T' in event_date_str:
-                try:
-                    dt = datetime.fromisoformat(event_date_str.replace('Z', '+00:00'))
-                    event_datetime = self.chicago_tz.localize(dt) if dt.tzinfo is None else dt.astimezone(self.chicago_tz)
-                except Exception:
-                    date_part = event_date_str.split('T')[0]
-                    dt = datetime.strptime(date_part, '%Y-%m-%d')
-                    event_time = datetime.strptime(event_time_str, '%H:%M').time()
-                    event_datetime = self.chicago_tz.localize(datetime.combine(dt.date(), event_time))
-            else:
-                event_date = datetime.strptime(event_date_str.split('T')[0], '%Y-%m-%d')
-                event_time = datetime.strptime(event_time_str, '%H:%M').time()
-                event_datetime = self.chicago_tz.localize(datetime.combine(event_date.date(), event_time))
-            return current_time > event_datetime
-        except Exception:
+    def _has_show_started(self, performer, current_time):
+        if not performer['event_start_time']:
             return False
+        event_datetime = _parse_event_dt(performer['event_date'], performer['event_start_time'], self.chicago_tz.zone)
+        return event_datetime is not None and current_time > event_datetime
 
 def main():
     print("Starting Automated Concert Discovery and Playlist Creator...")
@@ -565,19 +668,23 @@ def main():
         print("Could not get Spotify search access")
         return
     
-    performer_names = [p['performer_name'] for p in performers_data]
+    # Keep the first (closest) entry per artist so each is searched once
+    perf_by_name = {}
+    for p in performers_data:
+        perf_by_name.setdefault(p['performer_name'], p)
     
-    print(f"Searching Spotify for {len(performer_names)} artists...")
+    print(f"Searching Spotify for {len(perf_by_name)} artists...")
     results = []
-    for i, artist in enumerate(performer_names, 1):
-        if i % 10 == 0 or i == len(performer_names):
-            print(f"Processing {i}/{len(performer_names)} artists...")
-        result = spotify.search_artist(artist)
-        perf_data = next((p for p in performers_data if p['performer_name'] == artist), {})
-        result['venue'] = perf_data.get('venue', 'Unknown')
-        result['distance_miles'] = perf_data.get('distance_miles', float('inf'))
-        results.append(result)
-        time.sleep(0.5)
+    with ThreadPoolExecutor(max_workers=Config.SEARCH_CONCURRENCY) as executor:
+        searches = executor.map(spotify.search_artist, perf_by_name)
+        for i, ((artist, perf_data), result) in enumerate(zip(perf_by_name.items(), searches), 1):
+            if i % 10 == 0 or i == len(perf_by_name):
+                print(f"Processing {i}/{len(perf_by_name)} artists...")
+            result['venue'] = perf_data.get('venue', 'Unknown')
+            result['distance_miles'] = perf_data.get('distance_miles', float('inf'))
+            results.append(result)
+    
+    spotify.save_artist_cache()
     
     errors = sum(1 for r in results if 'error' in r)
     valid_results = [r for r in results if 'error' not in r]